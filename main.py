@@ -1,13 +1,296 @@
 #!/usr/bin/env python3
 import sys
 import os
+import argparse
+import hashlib
+import json
+import re
+import signal
+import socket
+import socketserver
+import stat
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QTabWidget, QTreeWidget, QTreeWidgetItem,
                              QVBoxLayout, QHBoxLayout, QWidget, QToolBar, QAction, QMenu,
-                             QHeaderView, QLabel, QLineEdit, QCheckBox, QMessageBox, QInputDialog)
+                             QHeaderView, QLabel, QLineEdit, QCheckBox, QMessageBox, QInputDialog,
+                             QDialog, QFormLayout, QPushButton, QPlainTextEdit, QFileDialog)
 from PyQt5.QtGui import QIcon, QColor
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QCoreApplication
 import subprocess
 import platform
+import time
+
+# docker command and column names for every resource Qocker tracks
+DOCKER_RESOURCES = {
+    "containers": (["docker", "ps", "-a", "--format", "{{.ID}}\\t{{.Names}}\\t{{.Image}}\\t{{.Status}}\\t{{.Ports}}"],
+                   ["id", "name", "image", "status", "ports"]),
+    "images": (["docker", "images", "--format", "{{.ID}}\\t{{.Repository}}\\t{{.Tag}}\\t{{.Size}}"],
+               ["id", "repository", "tag", "size"]),
+    "networks": (["docker", "network", "ls", "--format", "{{.ID}}\\t{{.Name}}\\t{{.Driver}}"],
+                 ["id", "name", "driver"]),
+    "volumes": (["docker", "volume", "ls", "--format", "{{.Name}}\\t{{.Driver}}\\t{{.Mountpoint}}"],
+                ["name", "driver", "mountpoint"]),
+}
+
+DEFAULT_API_ADDRESS = "127.0.0.1:8765"
+
+class DockerState:
+    """Latest docker listings, shared between the refresh timer and API clients.
+
+    Each snapshot holds the rows of the last successful refresh ("items"), when
+    that refresh happened ("refreshed_at", a Unix timestamp) and the error of the
+    most recent refresh if it failed ("error"), so clients can tell stale data.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.snapshots = {resource: {"items": [], "refreshed_at": None, "error": None}
+                          for resource in DOCKER_RESOURCES}
+        self.etags = {resource: self.make_etag(self.snapshots[resource]) for resource in DOCKER_RESOURCES}
+        self.version = 0
+
+    @staticmethod
+    def make_etag(snapshot):
+        # refreshed_at moves on every refresh, only the rows and the error make a change
+        return DockerState.hash_etag(json.dumps([snapshot["items"], snapshot["error"]], sort_keys=True))
+
+    @staticmethod
+    def hash_etag(payload):
+        return '"' + hashlib.sha1(payload.encode()).hexdigest() + '"'
+
+    def refresh(self, resource):
+        command, fields = DOCKER_RESOURCES[resource]
+        try:
+            output = subprocess.check_output(command, stderr=subprocess.STDOUT)
+            rows = []
+            for line in output.decode().strip().split("\n"):
+                if not line:
+                    continue
+                parts = line.split("\t")
+                if len(parts) < len(fields) - 1:
+                    raise ValueError(f"Unexpected {resource} line {repr(line)}")
+                parts += [""] * (len(fields) - len(parts))
+                rows.append(dict(zip(fields, parts)))
+        except subprocess.CalledProcessError as e:
+            self.update(resource, error=e.output.decode().strip() or str(e))
+            raise
+        except Exception as e:
+            self.update(resource, error=str(e))
+            raise
+
+        self.update(resource, items=rows, refreshed_at=time.time())
+        return rows
+
+    def update(self, resource, **changes):
+        with self.condition:
+            snapshot = dict(self.snapshots[resource], error=None)
+            snapshot.update(changes)
+            self.snapshots[resource] = snapshot
+            etag = self.make_etag(snapshot)
+            if etag != self.etags[resource]:
+                self.etags[resource] = etag
+                self.version += 1
+                self.condition.notify_all()
+
+    def refresh_all(self):
+        for resource in DOCKER_RESOURCES:
+            try:
+                self.refresh(resource)
+            except subprocess.CalledProcessError as e:
+                print(f"Error refreshing {resource}: {e.output.decode()}")
+            except Exception as e:
+                print(f"Unexpected error refreshing {resource}: {str(e)}")
+
+    def snapshot(self, resource=None):
+        """Return (etag, version, data) for one resource, or for all of them when resource is None."""
+        with self.condition:
+            if resource is not None:
+                return self.etags[resource], self.version, self.snapshots[resource]
+            etag = self.hash_etag("".join(self.etags[name] for name in DOCKER_RESOURCES))
+            return etag, self.version, dict(self.snapshots)
+
+    def wait_for_change(self, version, timeout):
+        """Block until the state moves past version or timeout expires, return the current version."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+class StateRequestHandler(BaseHTTPRequestHandler):
+    """Serve DockerState snapshots, conditional requests and a server-sent events feed.
+
+    GET /state or /<resource>   JSON snapshot with an ETag header. If-None-Match
+                                returns 304, and with ?wait=<seconds> the request
+                                is held until the data changes or the wait expires.
+    GET /events                 text/event-stream with one event per changed resource.
+    """
+    protocol_version = "HTTP/1.1"
+    max_wait = 300
+    keepalive_interval = 15
+
+    def do_GET(self):
+        allowed_hosts = self.server.allowed_hosts
+        host = self.headers.get("Host")
+        # HTTP/1.0 clients may send no Host at all, browsers always do
+        if allowed_hosts is not None and host is not None and host not in allowed_hosts:
+            # refuse DNS rebinding: a web page must not read the API through its own host name
+            self.send_json(403, {"error": "Host not allowed"})
+            return
+
+        url = urlparse(self.path)
+        path = url.path.strip("/")
+        query = parse_qs(url.query)
+        if path == "events":
+            self.stream_events()
+        elif path == "state" or path in DOCKER_RESOURCES:
+            self.send_snapshot(None if path == "state" else path, query)
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint /{path}"})
+
+    def send_snapshot(self, resource, query):
+        state = self.server.state
+        etag, version, data = state.snapshot(resource)
+        if_none_match = self.headers.get("If-None-Match")
+        try:
+            wait = min(float(query.get("wait", ["0"])[0]), self.max_wait)
+        except ValueError:
+            self.send_json(400, {"error": "wait must be a number of seconds"})
+            return
+
+        if etag_matches(if_none_match, etag) and wait > 0:
+            # Long-poll: hold the request until the snapshot's ETag moves on.
+            deadline = time.monotonic() + wait
+            while etag_matches(if_none_match, etag):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                version = state.wait_for_change(version, remaining)
+                etag, version, data = state.snapshot(resource)
+
+        if etag_matches(if_none_match, etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_json(200, data, etag)
+
+    def send_json(self, code, data, etag=None):
+        body = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_events(self):
+        state = self.server.state
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        sent = {}
+        try:
+            while True:
+                # Read the version first so a change racing the loop below is not missed
+                with state.condition:
+                    version = state.version
+                for resource in DOCKER_RESOURCES:
+                    etag, _, data = state.snapshot(resource)
+                    if sent.get(resource) != etag:
+                        self.wfile.write(f"event: {resource}\nid: {etag}\ndata: {json.dumps(data)}\n\n".encode())
+                        sent[resource] = etag
+                self.wfile.flush()
+                if state.wait_for_change(version, self.keepalive_interval) == version:
+                    self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+class StateHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        super().server_bind()
+        port = self.server_address[1]
+        names = ["127.0.0.1", "localhost", "[::1]"]
+        self.allowed_hosts = set(names) | {f"{name}:{port}" for name in names}
+
+class StateHTTP6Server(StateHTTPServer):
+    address_family = socket.AF_INET6
+
+class StateUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # access to the socket is controlled by its file permissions
+    allowed_hosts = None
+
+    def server_bind(self):
+        # create the socket as 0600 right away, a chmod after bind() leaves a window open
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+
+def start_api_server(state, address):
+    """Serve state on address, either "unix:/path/to/socket", "host:port" or "port"."""
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        try:
+            if not stat.S_ISSOCK(os.lstat(path).st_mode):
+                raise FileExistsError(f"{path} exists and is not a socket")
+            os.unlink(path)  # stale socket left by a previous run
+        except FileNotFoundError:
+            pass
+        server = StateUnixServer(path, StateRequestHandler)
+    else:
+        host, _, port = address.rpartition(":")
+        host = host.strip("[]") or "127.0.0.1"
+        if host not in ("127.0.0.1", "localhost", "::1"):
+            raise ValueError(f"{host} is not a loopback address, use 127.0.0.1, localhost, [::1] or a unix: socket")
+        server_class = StateHTTP6Server if host == "::1" else StateHTTPServer
+        server = server_class((host, int(port)), StateRequestHandler)
+    server.state = state
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    print(f"Serving Docker state on {address}")
+    return server
+
+def stop_api_server(server):
+    server.shutdown()
+    server.server_close()
 
 class StatusDelegate(QWidget):
     def __init__(self, status, parent=None):
@@ -80,9 +363,343 @@ class LogsOpener(QThread):
         except Exception as e:
             self.error.emit(f"Failed to open terminal: {str(e)}")
 
+def dockerignore_regex(pattern):
+    # "**" matches any number of directories, other wildcards stay within one path segment
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            # character class as in Go's filepath.Match: only a leading "^" negates, "-" makes ranges
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            negate = body.startswith("^")
+            if negate:
+                body = body[1:]
+            body = "".join(c if c == "-" else re.escape(c) for c in body)
+            regex += "[" + ("^" if negate else "") + body + "]"
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return re.compile(regex + r"\Z")
+
+def load_dockerignore(context_dir):
+    patterns = []
+    try:
+        with open(os.path.join(context_dir, ".dockerignore"), encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                exclude = not line.startswith("!")
+                pattern = os.path.normpath(line.lstrip("!").strip()).replace(os.sep, "/").lstrip("/")
+                patterns.append((dockerignore_regex(pattern), exclude, pattern))
+    except FileNotFoundError:
+        pass
+    return patterns
+
+def is_ignored(relpath, patterns):
+    # a pattern matching a directory also matches everything inside it, the last matching pattern wins
+    parts = relpath.split("/")
+    candidates = ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+    ignored = False
+    for regex, exclude, _ in patterns:
+        if any(regex.match(candidate) for candidate in candidates):
+            ignored = exclude
+    return ignored
+
+def may_include_below(reldir, patterns):
+    # whether a "!" exception could re-include something inside reldir, which must then still be walked
+    dir_parts = reldir.split("/")
+    for _, exclude, pattern in patterns:
+        if exclude:
+            continue
+        pattern_parts = pattern.split("/")
+        for i, dir_part in enumerate(dir_parts):
+            if i < len(pattern_parts) and pattern_parts[i] == "**":
+                return True
+            if i >= len(pattern_parts) - 1 or not dockerignore_regex(pattern_parts[i]).match(dir_part):
+                break
+        else:
+            return True
+    return False
+
+class ImageBuilder(QThread):
+    """Run docker build, streaming the context to it as a tar archive on stdin.
+
+    Output lines are queued for the UI to collect with take_output() in batches.
+    """
+    build_finished = pyqtSignal(int)
+
+    def __init__(self, context_dir, dockerfile, tag):
+        super().__init__()
+        self.context_dir = context_dir
+        self.dockerfile = dockerfile
+        self.tag = tag
+        self.process = None
+        self.cancelled = False
+        self.output_lock = threading.Lock()
+        self.pending_output = []
+
+    def take_output(self):
+        with self.output_lock:
+            lines, self.pending_output = self.pending_output, []
+        return lines
+
+    def append_output(self, line):
+        with self.output_lock:
+            self.pending_output.append(line)
+
+    def dockerfile_arcname(self, patterns):
+        relpath = os.path.relpath(self.dockerfile, self.context_dir).replace(os.sep, "/")
+        if relpath.startswith("../") or is_ignored(relpath, patterns):
+            # the Dockerfile would not be in the archive, ship a copy at the context root
+            return ".qocker.Dockerfile"
+        return relpath
+
+    def write_context(self, stream, patterns, dockerfile_arcname):
+        # "w|" writes the archive block by block straight into the pipe
+        with tarfile.open(fileobj=stream, mode="w|") as tar:
+            for root, dirs, files in os.walk(self.context_dir):
+                reldir = os.path.relpath(root, self.context_dir).replace(os.sep, "/")
+                reldir = "" if reldir == "." else reldir + "/"
+                dirs[:] = [d for d in dirs
+                           if not is_ignored(reldir + d, patterns) or may_include_below(reldir + d, patterns)]
+                for name in dirs:
+                    if not is_ignored(reldir + name, patterns):
+                        tar.add(os.path.join(root, name), arcname=reldir + name, recursive=False)
+                for name in files:
+                    relpath = reldir + name
+                    if relpath != ".dockerignore" and is_ignored(relpath, patterns):
+                        continue
+                    tar.add(os.path.join(root, name), arcname=relpath, recursive=False)
+            if dockerfile_arcname == ".qocker.Dockerfile":
+                tar.add(self.dockerfile, arcname=dockerfile_arcname)
+
+    def send_context(self, patterns, dockerfile_arcname):
+        try:
+            self.write_context(self.process.stdin, patterns, dockerfile_arcname)
+        except BrokenPipeError:
+            pass  # docker exited early, its output explains why
+        except Exception as e:
+            self.append_output(f"Failed to send build context: {str(e)}")
+            self.process.kill()
+        finally:
+            try:
+                self.process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def run(self):
+        try:
+            patterns = load_dockerignore(self.context_dir)
+            dockerfile_arcname = self.dockerfile_arcname(patterns)
+            command = ["docker", "build", "--progress=plain", "-f", dockerfile_arcname]
+            if self.tag:
+                command += ["-t", self.tag]
+            command.append("-")
+            env = dict(os.environ, DOCKER_BUILDKIT="1")
+
+            self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            stderr=subprocess.STDOUT, env=env)
+        except Exception as e:
+            self.append_output(f"Failed to start docker build: {str(e)}")
+            self.build_finished.emit(-1)
+            return
+        if self.cancelled:
+            self.process.kill()
+
+        sender = threading.Thread(target=self.send_context, args=(patterns, dockerfile_arcname), daemon=True)
+        sender.start()
+        for line in self.process.stdout:
+            self.append_output(line.decode(errors="replace").rstrip("\n"))
+        sender.join()
+        self.build_finished.emit(self.process.wait())
+
+    def cancel(self):
+        self.cancelled = True
+        if self.process and self.process.poll() is None:
+            self.process.kill()
+
+class BuildDialog(QDialog):
+    # BuildKit plain progress lines: "#5 [2/3] RUN make", "#5 CACHED", "#5 DONE 1.2s"
+    STEP_RE = re.compile(r"^#(\d+) \[(.+?)\] (.*)$")
+    CACHED_RE = re.compile(r"^#(\d+) CACHED$")
+    DONE_RE = re.compile(r"^#(\d+) DONE (\d+(?:\.\d+)?)s$")
+    ERROR_RE = re.compile(r"^#(\d+) ERROR")
+    # only Dockerfile instructions ("[2/3]", "[builder 1/4]") produce cacheable layers
+    LAYER_RE = re.compile(r"\d+/\d+$")
+
+    build_succeeded = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Build Image")
+        self.resize(800, 600)
+        self.builder = None
+        self.steps = {}
+
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        layout.addLayout(form)
+
+        self.context_input = QLineEdit()
+        context_browse = QPushButton("Browse...")
+        context_browse.clicked.connect(self.browse_context)
+        context_row = QHBoxLayout()
+        context_row.addWidget(self.context_input)
+        context_row.addWidget(context_browse)
+        form.addRow("Context directory:", context_row)
+
+        self.dockerfile_input = QLineEdit()
+        self.dockerfile_input.setPlaceholderText("Dockerfile in the context directory")
+        dockerfile_browse = QPushButton("Browse...")
+        dockerfile_browse.clicked.connect(self.browse_dockerfile)
+        dockerfile_row = QHBoxLayout()
+        dockerfile_row.addWidget(self.dockerfile_input)
+        dockerfile_row.addWidget(dockerfile_browse)
+        form.addRow("Dockerfile:", dockerfile_row)
+
+        self.tag_input = QLineEdit()
+        self.tag_input.setPlaceholderText("e.g., myapp:latest")
+        form.addRow("Tag:", self.tag_input)
+
+        self.build_button = QPushButton(QIcon.fromTheme("system-run"), "Build")
+        self.build_button.clicked.connect(self.start_build)
+        layout.addWidget(self.build_button)
+
+        self.steps_tree = QTreeWidget()
+        self.steps_tree.setHeaderLabels(["Step", "Cache", "Time"])
+        self.steps_tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.steps_tree.header().setStretchLastSection(False)
+        layout.addWidget(self.steps_tree)
+
+        self.output_view = QPlainTextEdit()
+        self.output_view.setReadOnly(True)
+        self.output_view.setMaximumBlockCount(10000)
+        layout.addWidget(self.output_view)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        # Collect builder output in batches instead of one UI update per line
+        self.output_timer = QTimer(self)
+        self.output_timer.timeout.connect(self.flush_output)
+
+    def browse_context(self):
+        directory = QFileDialog.getExistingDirectory(self, "Select Build Context", self.context_input.text())
+        if directory:
+            self.context_input.setText(directory)
+
+    def browse_dockerfile(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Select Dockerfile", self.context_input.text())
+        if path:
+            self.dockerfile_input.setText(path)
+
+    def start_build(self):
+        context_dir = self.context_input.text().strip()
+        if not os.path.isdir(context_dir):
+            QMessageBox.warning(self, "Invalid Context", "Please select an existing context directory.")
+            return
+        dockerfile = self.dockerfile_input.text().strip() or os.path.join(context_dir, "Dockerfile")
+        if not os.path.isfile(dockerfile):
+            QMessageBox.warning(self, "Invalid Dockerfile", f"Dockerfile '{dockerfile}' does not exist.")
+            return
+
+        self.steps = {}
+        self.steps_tree.clear()
+        self.output_view.clear()
+        self.build_button.setEnabled(False)
+        self.status_label.setText("Building...")
+
+        self.builder = ImageBuilder(os.path.abspath(context_dir), os.path.abspath(dockerfile), self.tag_input.text().strip())
+        self.builder.build_finished.connect(self.finish_build)
+        self.builder.start()
+        self.output_timer.start(100)
+
+    def flush_output(self):
+        lines = self.builder.take_output()
+        if not lines:
+            return
+        self.output_view.appendPlainText("\n".join(lines))
+        for line in lines:
+            self.update_step(line)
+
+    def update_step(self, line):
+        match = self.STEP_RE.match(line)
+        if match:
+            step_id, stage, instruction = match.groups()
+            if step_id not in self.steps:
+                item = QTreeWidgetItem([f"[{stage}] {instruction}", "", "running"])
+                item.setData(0, Qt.UserRole, bool(self.LAYER_RE.search(stage)))
+                self.steps_tree.addTopLevelItem(item)
+                self.steps[step_id] = item
+            return
+
+        match = self.CACHED_RE.match(line)
+        if match and match.group(1) in self.steps:
+            item = self.steps[match.group(1)]
+            item.setText(1, "hit")
+            item.setText(2, "")
+            item.setForeground(1, QColor("green"))
+            return
+
+        match = self.DONE_RE.match(line)
+        if match and match.group(1) in self.steps:
+            item = self.steps[match.group(1)]
+            if item.data(0, Qt.UserRole) and not item.text(1):
+                item.setText(1, "miss")
+                item.setForeground(1, QColor("orange"))
+            item.setText(2, f"{match.group(2)}s")
+            return
+
+        match = self.ERROR_RE.match(line)
+        if match and match.group(1) in self.steps:
+            item = self.steps[match.group(1)]
+            item.setText(2, "error")
+            item.setForeground(2, QColor("red"))
+
+    def finish_build(self, returncode):
+        self.output_timer.stop()
+        self.flush_output()
+        self.build_button.setEnabled(True)
+
+        cache_column = [self.steps_tree.topLevelItem(i).text(1) for i in range(self.steps_tree.topLevelItemCount())]
+        summary = f"{cache_column.count('hit')} cached, {cache_column.count('miss')} built"
+        if returncode == 0:
+            self.status_label.setText(f"Build succeeded ({summary})")
+            self.build_succeeded.emit()
+        else:
+            self.status_label.setText(f"Build failed with exit code {returncode} ({summary})")
+
+    def stop_build(self):
+        if self.builder and self.builder.isRunning():
+            self.builder.cancel()
+            self.builder.wait()
+
+    # Esc, the close button and closeEvent all end up here
+    def done(self, result):
+        if self.builder and self.builder.isRunning():
+            self.builder.cancel()
+        super().done(result)
+
 class DockerGUI(QMainWindow):
-    def __init__(self):
+    def __init__(self, state=None):
         super().__init__()
+        self.state = state or DockerState()
+        self.build_dialog = None
         self.setWindowTitle("Qocker - Docker Graphical User Interface")
         self.setGeometry(100, 100, 1000, 600)
 
@@ -211,6 +828,10 @@ class DockerGUI(QMainWindow):
         self.pull_image_action.triggered.connect(self.pull_image)
         self.toolbar.addAction(self.pull_image_action)
 
+        self.build_image_action = QAction(QIcon.fromTheme("system-run"), "Build Image", self)
+        self.build_image_action.triggered.connect(self.build_image)
+        self.toolbar.addAction(self.build_image_action)
+
         self.remove_image_action = QAction(QIcon.fromTheme("edit-delete"), "Remove Image", self)
         self.remove_image_action.triggered.connect(self.remove_image)
         self.toolbar.addAction(self.remove_image_action)
@@ -254,6 +875,7 @@ class DockerGUI(QMainWindow):
         self.remove_volume_action.setVisible(False)
         self.terminal_action.setVisible(False)
         self.pull_image_action.setVisible(False)
+        self.build_image_action.setVisible(False)
         self.remove_image_action.setVisible(False)
         self.logs_action.setVisible(False)
 
@@ -266,6 +888,7 @@ class DockerGUI(QMainWindow):
             self.logs_action.setVisible(True)
         elif index == 1:  # Images tab
             self.pull_image_action.setVisible(True)
+            self.build_image_action.setVisible(True)
             self.remove_image_action.setVisible(True)
         elif index == 2:  # Networks tab
             self.create_network_action.setVisible(True)
@@ -274,6 +897,13 @@ class DockerGUI(QMainWindow):
             self.create_volume_action.setVisible(True)
             self.remove_volume_action.setVisible(True)
 
+    # override QMainWindow.closeEvent
+    def closeEvent(self, event):
+        # don't leave a docker build running behind a destroyed thread
+        if self.build_dialog is not None:
+            self.build_dialog.stop_build()
+        super(DockerGUI, self).closeEvent(event)
+
     # override QMainWindow.createPopupMenu
     def createPopupMenu(self):
         filtered_menu = super(DockerGUI, self).createPopupMenu()
@@ -332,9 +962,12 @@ class DockerGUI(QMainWindow):
         elif current_tab == self.images_tab:
             pull_action = QAction("Pull", self)
             pull_action.triggered.connect(self.pull_image)
+            build_action = QAction("Build", self)
+            build_action.triggered.connect(self.build_image)
             remove_action = QAction("Remove", self)
             remove_action.triggered.connect(self.remove_image)
             context_menu.addAction(pull_action)
+            context_menu.addAction(build_action)
             context_menu.addSeparator()
             context_menu.addAction(remove_action)
         elif current_tab == self.networks_tab:
@@ -399,23 +1032,19 @@ class DockerGUI(QMainWindow):
         selected_items = self.get_selected_items(self.containers_tree)
         self.containers_tree.clear()
         try:
-            output = subprocess.check_output(["docker", "ps", "-a", "--format", "{{.ID}}\\t{{.Names}}\\t{{.Image}}\\t{{.Status}}\\t{{.Ports}}"], stderr=subprocess.STDOUT)
-            if output.strip():
-                containers = output.decode().strip().split("\n")
+            containers = self.state.refresh("containers")
+            if containers:
                 for container in containers:
-                    parts = container.split("\t")
-                    id, name, image, status = parts[:4]
-                    ports = parts[4] if len(parts) > 4 else ""
-                    item = QTreeWidgetItem([id, name, image, "", ports])  # Empty string for status column
-                    status_widget = StatusDelegate(status)
+                    item = QTreeWidgetItem([container["id"], container["name"], container["image"], "", container["ports"]])  # Empty string for status column
+                    status_widget = StatusDelegate(container["status"])
                     self.containers_tree.addTopLevelItem(item)
                     self.containers_tree.setItemWidget(item, 3, status_widget)
                 self.filter_tree(self.containers_tree, self.containers_tab.findChild(QLineEdit).text())
                 self.restore_selection(self.containers_tree, selected_items)
         except subprocess.CalledProcessError as e:
             print(f"Error refreshing containers: {e.output.decode()}")
-        except ValueError:
-            print(f"Error parsing container list {repr(containers)}")
+        except ValueError as e:
+            print(f"Error parsing container list: {str(e)}")
         except Exception as e:
             print(f"Unexpected error refreshing containers: {str(e)}")
         QTimer.singleShot(0, lambda: self.containers_tree.verticalScrollBar().setValue(scroll_position))
@@ -425,12 +1054,10 @@ class DockerGUI(QMainWindow):
         selected_items = self.get_selected_items(self.images_tree)
         self.images_tree.clear()
         try:
-            output = subprocess.check_output(["docker", "images", "--format", "{{.ID}}\\t{{.Repository}}\\t{{.Tag}}\\t{{.Size}}"], stderr=subprocess.STDOUT)
-            if output.strip():
-                images = output.decode().strip().split("\n")
+            images = self.state.refresh("images")
+            if images:
                 for image in images:
-                    id, repository, tag, size = image.split("\t")
-                    item = QTreeWidgetItem([id, repository, tag, size])
+                    item = QTreeWidgetItem([image["id"], image["repository"], image["tag"], image["size"]])
                     self.images_tree.addTopLevelItem(item)
                 
                 self.filter_tree(self.images_tree, self.images_tab.findChild(QLineEdit).text())
@@ -446,12 +1073,10 @@ class DockerGUI(QMainWindow):
         selected_items = self.get_selected_items(self.networks_tree)
         self.networks_tree.clear()
         try:
-            output = subprocess.check_output(["docker", "network", "ls", "--format", "{{.ID}}\\t{{.Name}}\\t{{.Driver}}"], stderr=subprocess.STDOUT)
-            if output.strip():
-                networks = output.decode().strip().split("\n")
+            networks = self.state.refresh("networks")
+            if networks:
                 for network in networks:
-                    id, name, driver = network.split("\t")
-                    item = QTreeWidgetItem([id, name, driver])
+                    item = QTreeWidgetItem([network["id"], network["name"], network["driver"]])
                     self.networks_tree.addTopLevelItem(item)
                 self.filter_tree(self.networks_tree, self.networks_tab.findChild(QLineEdit).text())
                 self.restore_selection(self.networks_tree, selected_items)
@@ -466,12 +1091,10 @@ class DockerGUI(QMainWindow):
         selected_items = self.get_selected_items(self.volumes_tree)
         self.volumes_tree.clear()
         try:
-            output = subprocess.check_output(["docker", "volume", "ls", "--format", "{{.Name}}\\t{{.Driver}}\\t{{.Mountpoint}}"], stderr=subprocess.STDOUT)
-            if output.strip():
-                volumes = output.decode().strip().split("\n")
+            volumes = self.state.refresh("volumes")
+            if volumes:
                 for volume in volumes:
-                    name, driver, mountpoint = volume.split("\t")
-                    item = QTreeWidgetItem([name, driver, mountpoint])
+                    item = QTreeWidgetItem([volume["name"], volume["driver"], volume["mountpoint"]])
                     self.volumes_tree.addTopLevelItem(item)
                 self.filter_tree(self.volumes_tree, self.volumes_tab.findChild(QLineEdit).text())
                 self.restore_selection(self.volumes_tree, selected_items)
@@ -554,6 +1177,14 @@ class DockerGUI(QMainWindow):
 
         self.refresh_images()
 
+    def build_image(self):
+        if self.build_dialog is None:
+            self.build_dialog = BuildDialog(self)
+            self.build_dialog.build_succeeded.connect(self.refresh_images)
+        self.build_dialog.show()
+        self.build_dialog.raise_()
+        self.build_dialog.activateWindow()
+
     def remove_image(self):
         selected_items = self.images_tree.selectedItems()
         if not selected_items:
@@ -671,8 +1302,52 @@ class DockerGUI(QMainWindow):
     def show_logs_error(self, error_message):
         QMessageBox.critical(self, "Error", error_message)
 
+def parse_arguments(argv):
+    parser = argparse.ArgumentParser(description="Qocker - Docker Graphical User Interface")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without windows, only refreshing Docker state for the API")
+    parser.add_argument("--listen", metavar="ADDRESS",
+                        help="serve Docker state over HTTP on ADDRESS: unix:/path/to/socket, or a loopback "
+                             "host:port or port, where host is 127.0.0.1, localhost or [::1] "
+                             f"(default with --headless: {DEFAULT_API_ADDRESS})")
+    parser.add_argument("--interval", type=int, default=1000, metavar="MS",
+                        help="API refresh interval in milliseconds (default: 1000)")
+    # leave unknown arguments for Qt
+    return parser.parse_known_args(argv[1:])
+
+def serve_api(app, state, address):
+    try:
+        server = start_api_server(state, address)
+    except (OSError, ValueError) as e:
+        print(f"Failed to serve Docker state on {address}: {str(e)}")
+        sys.exit(1)
+    app.aboutToQuit.connect(lambda: stop_api_server(server))
+    return server
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = DockerGUI()
+    args, qt_args = parse_arguments(sys.argv)
+    state = DockerState()
+
+    if args.headless:
+        app = QCoreApplication(sys.argv[:1] + qt_args)
+        # quit through Qt so the API server is shut down and its socket removed
+        signal.signal(signal.SIGINT, lambda *_: app.quit())
+        signal.signal(signal.SIGTERM, lambda *_: app.quit())
+        server = serve_api(app, state, args.listen or DEFAULT_API_ADDRESS)
+        state.refresh_all()
+        # the timer also gives Python a chance to run the signal handlers above
+        refresh_timer = QTimer()
+        refresh_timer.timeout.connect(state.refresh_all)
+        refresh_timer.start(args.interval)
+        sys.exit(app.exec_())
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = DockerGUI(state)
+    if args.listen:
+        server = serve_api(app, state, args.listen)
+        # keep the API fresh while the window's auto-refresh is switched off
+        state_timer = QTimer()
+        state_timer.timeout.connect(lambda: window.refresh_timer.isActive() or state.refresh_all())
+        state_timer.start(args.interval)
     window.show()
     sys.exit(app.exec_())